@@ -43,6 +43,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'urunler.profiling.SamplingProfilerMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -125,6 +126,23 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Arka plan işlerinin (export_catalog) dosya yazdığı dizin
+JOB_EXPORT_DIR = BASE_DIR / 'exports'
+
+# run_worker bu aralıkla sinyal yazar; sinyali JOB_LEASE_TIMEOUT saniyeden eski
+# 'running' işler ölü worker'a ait sayılıp yeniden alınır
+JOB_HEARTBEAT_INTERVAL = 30
+JOB_LEASE_TIMEOUT = 300
+JOB_MAX_ATTEMPTS = 3
+
+# İstek profilleyici (urunler.profiling); oran 0 ve token boşsa kapalıdır
+PROFILER_SAMPLE_RATE = 0.0
+PROFILER_TOKEN = None  # X-Profile header'ı bu değerle eşleşirse istek profillenir
+PROFILER_INTERVAL = 0.001
+PROFILER_FORMAT = 'collapsed'  # 'collapsed' veya 'speedscope'
+PROFILER_DIR = BASE_DIR / 'profiles'
+PROFILER_MAX_FILES = 200  # en eski profiller silinir; None ile sınırsız
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
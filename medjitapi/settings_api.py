@@ -0,0 +1,56 @@
+"""
+API-only worker settings for medjitapi project.
+
+Extends the default settings for processes that only serve the JSON API
+under ``/api/urunler/``. The admin, sessions and messages apps and the
+staticfiles and template settings are left out, and the middleware chain
+is reduced to CORS, security headers and common URL handling.
+
+DRF itself still imports ``django.template`` and ``django.contrib.auth``
+while loading its views and renderers, so those modules stay in memory;
+what this profile avoids is admin autodiscovery, the extra apps and
+middleware, and rendering through the browsable API. Optional subsystems
+stay out of the import path until used: the job runner (``urunler.jobs``)
+is imported on the first job request, and the profiler middleware is only
+installed when ``PROFILER_SAMPLE_RATE`` or ``PROFILER_TOKEN`` is set.
+
+Run a worker with ``DJANGO_SETTINGS_MODULE=medjitapi.settings_api`` or
+point the server at ``medjitapi.wsgi_api:application``.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    'rest_framework',
+    'corsheaders',
+    'urunler',
+]
+
+MIDDLEWARE = [
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+# Settings that override PROFILER_* after this module must add the
+# middleware themselves.
+if PROFILER_SAMPLE_RATE > 0 or PROFILER_TOKEN:  # noqa: F405
+    MIDDLEWARE.insert(0, 'urunler.profiling.SamplingProfilerMiddleware')
+
+ROOT_URLCONF = 'medjitapi.urls_api'
+
+TEMPLATES = []
+
+WSGI_APPLICATION = 'medjitapi.wsgi_api.application'
+
+# Without django.contrib.auth in INSTALLED_APPS there is no AnonymousUser
+# to fall back on, and the browsable API renderer needs template settings.
+# Parsers are left at DRF's defaults so both worker pools accept the
+# same request bodies.
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [],
+    'UNAUTHENTICATED_USER': None,
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+    ],
+}
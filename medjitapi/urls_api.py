@@ -0,0 +1,13 @@
+"""
+URL configuration for API-only workers.
+
+Same routes as ``medjitapi.urls`` minus the admin, so the admin site and
+its autodiscovery are never imported.
+"""
+from django.urls import path, include
+from . import views
+
+urlpatterns = [
+    path('health/', views.health_check, name='health_check'),
+    path('api/urunler/', include('urunler.urls')),
+]
@@ -0,0 +1,361 @@
+"""
+Veritabanı tabanlı arka plan işleri.
+
+Web katmanı ``enqueue`` ile Job kaydı oluşturur; ``run_worker`` komutu
+kuyruktaki işleri ``claim_next`` ile alır ve ``run_job`` ile çalıştırır.
+Harici bir broker gerekmez.
+"""
+import json
+import logging
+import threading
+import traceback
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection, models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job, Urun, Supplier
+
+logger = logging.getLogger(__name__)
+
+JOB_HANDLERS = {}
+
+
+class LeaseLost(Exception):
+    """İş, lease süresi dolduğu için başka bir worker'a geçti"""
+
+
+def register(kind, retryable=True):
+    """
+    Bir fonksiyonu verilen isimle iş handler'ı olarak kaydeder.
+    ``retryable=False`` olan işler yarıda kalırsa yeniden çalıştırılmaz,
+    başarısız olarak kapatılır.
+    """
+    def decorator(func):
+        func.retryable = retryable
+        JOB_HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+def _retryable(kind):
+    handler = JOB_HANDLERS.get(kind)
+    return handler is not None and handler.retryable
+
+
+def enqueue(kind, params=None):
+    """Yeni bir işi kuyruğa ekler"""
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f'Unknown job kind: {kind}')
+    return Job.objects.create(kind=kind, params=params or {})
+
+
+def _lease_timeout():
+    return timedelta(seconds=getattr(settings, 'JOB_LEASE_TIMEOUT', 300))
+
+
+def _claimable():
+    """Kuyruktaki işler ve sinyali lease süresini aşmış 'running' işler"""
+    stale_before = timezone.now() - _lease_timeout()
+    return Job.objects.filter(
+        Q(status=Job.STATUS_QUEUED)
+        | Q(status=Job.STATUS_RUNNING, son_sinyal_tarihi__lt=stale_before)
+    ).order_by('id')
+
+
+def _expire(job_id, error):
+    """Yeniden alınamayacak işi başarısız olarak kapatır"""
+    Job.objects.filter(id=job_id).update(
+        status=Job.STATUS_FAILED,
+        error=error,
+        bitis_tarihi=timezone.now(),
+    )
+
+
+def _reclaim_error(kind, attempts, max_attempts):
+    """Süresi dolmuş bir iş yeniden alınamıyorsa hata mesajını döner"""
+    if not _retryable(kind):
+        return 'Worker lease expired and this job kind is not safe to retry'
+    if attempts >= max_attempts:
+        return 'Worker lease expired too many times'
+    return None
+
+
+def claim_next(worker):
+    """
+    Kuyruktaki en eski işi bu worker adına alır, yoksa None döner.
+    Worker'ı ölmüş (sinyali JOB_LEASE_TIMEOUT'u aşmış) 'running' işler de
+    yeniden alınır; JOB_MAX_ATTEMPTS denemeden sonra ya da tekrar
+    çalıştırılması güvenli olmayan işlerde başarısız sayılır.
+    PostgreSQL'de SELECT ... FOR UPDATE SKIP LOCKED kullanılır; bunu
+    desteklemeyen veritabanlarında (SQLite) koşullu UPDATE ile alınır.
+    """
+    max_attempts = getattr(settings, 'JOB_MAX_ATTEMPTS', 3)
+    now = timezone.now()
+    claim = {
+        'status': Job.STATUS_RUNNING,
+        'worker': worker,
+        'baslama_tarihi': now,
+        'son_sinyal_tarihi': now,
+    }
+
+    if connection.features.has_select_for_update_skip_locked:
+        while True:
+            with transaction.atomic():
+                job = _claimable().select_for_update(skip_locked=True).first()
+                if job is None:
+                    return None
+                error = job.status == Job.STATUS_RUNNING and _reclaim_error(job.kind, job.attempts, max_attempts)
+                if error:
+                    _expire(job.id, error)
+                    continue
+                for field, value in claim.items():
+                    setattr(job, field, value)
+                job.attempts += 1
+                job.save(update_fields=list(claim) + ['attempts'])
+                return job
+
+    # Başka bir worker aynı işi önce aldıysa UPDATE 0 satır etkiler; sıradakine geçilir
+    candidates = _claimable().values_list('id', 'kind', 'status', 'son_sinyal_tarihi', 'attempts')[:20]
+    for job_id, kind, job_status, heartbeat, attempts in candidates:
+        unchanged = Job.objects.filter(id=job_id, status=job_status, son_sinyal_tarihi=heartbeat)
+        error = job_status == Job.STATUS_RUNNING and _reclaim_error(kind, attempts, max_attempts)
+        if error:
+            if unchanged.exists():
+                _expire(job_id, error)
+            continue
+        if unchanged.update(attempts=F('attempts') + 1, **claim):
+            return Job.objects.get(id=job_id)
+    return None
+
+
+class Heartbeat(threading.Thread):
+    """Çalışan iş için periyodik olarak son_sinyal_tarihi yazar"""
+
+    def __init__(self, job):
+        super().__init__(name=f'job-heartbeat-{job.pk}', daemon=True)
+        self.job = job
+        self.interval = getattr(settings, 'JOB_HEARTBEAT_INTERVAL', 30)
+        self._stop_event = threading.Event()
+
+    def beat(self):
+        close_old_connections()
+        Job.objects.filter(pk=self.job.pk, worker=self.job.worker).update(
+            son_sinyal_tarihi=timezone.now()
+        )
+
+    def run(self):
+        try:
+            while not self._stop_event.wait(self.interval):
+                # Tek bir veritabanı hatası sinyali durdurmamalı; aksi halde
+                # iş hâlâ çalışırken lease dolar ve başka bir worker'a geçer
+                try:
+                    self.beat()
+                except DatabaseError:
+                    logger.exception('Heartbeat for job %s failed', self.job.pk)
+        finally:
+            connection.close()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _finish(job, **fields):
+    """
+    İşin son durumunu yazar. Lease süresi dolup iş başka bir worker'a
+    geçtiyse satır güncellenmez.
+    """
+    fields['bitis_tarihi'] = timezone.now()
+    for field, value in fields.items():
+        setattr(job, field, value)
+    Job.objects.filter(pk=job.pk, worker=job.worker, status=Job.STATUS_RUNNING).update(**fields)
+    return job
+
+
+def _requeue(job):
+    """
+    Düzgün kapanan worker'ın işini kuyruğa geri koyar; bu deneme
+    JOB_MAX_ATTEMPTS hesabına sayılmaz.
+    """
+    Job.objects.filter(pk=job.pk, worker=job.worker, status=Job.STATUS_RUNNING).update(
+        status=Job.STATUS_QUEUED,
+        worker='',
+        baslama_tarihi=None,
+        son_sinyal_tarihi=None,
+        attempts=F('attempts') - 1,
+    )
+    job.status = Job.STATUS_QUEUED
+    return job
+
+
+def run_job(job):
+    """
+    Alınmış bir işi çalıştırır ve sonucunu kaydeder. Worker kesilirse
+    (KeyboardInterrupt / SystemExit) iş kuyruğa geri konur, tekrar
+    çalıştırılması güvenli değilse başarısız olarak işaretlenir; istisna
+    yeniden fırlatılır.
+    """
+    handler = JOB_HANDLERS.get(job.kind)
+    heartbeat = Heartbeat(job)
+    heartbeat.start()
+    try:
+        if handler is None:
+            raise ValueError(f'Unknown job kind: {job.kind}')
+        result = handler(job)
+    except Exception:
+        logger.exception('Job %s (%s) failed', job.pk, job.kind)
+        return _finish(job, status=Job.STATUS_FAILED, error=traceback.format_exc())
+    except BaseException:
+        if _retryable(job.kind):
+            _requeue(job)
+        else:
+            _finish(job, status=Job.STATUS_FAILED, error='Worker interrupted while running the job')
+        raise
+    finally:
+        heartbeat.stop()
+    return _finish(job, status=Job.STATUS_SUCCEEDED, result=result)
+
+
+def recompute_supplier_summaries(batch_size=500, on_batch=None):
+    """
+    Tüm ürünlerin tedarikçi özet alanlarını id sırasıyla batch'ler halinde
+    yeniden hesaplar. ``on_batch(updated)`` her batch sonrası çağrılır.
+    """
+    aggregates = {
+        f'_{field}': expression
+        for field, expression in Urun.supplier_summary_aggregates(prefix='suppliers__').items()
+    }
+    updated = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            # Aynı anda çalışan Supplier yazmaları ile çakışmamak için batch kilitlenir
+            ids = list(
+                Urun.objects.select_for_update()
+                .filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            urunler = list(
+                Urun.objects.filter(id__in=ids).annotate(**aggregates).order_by('id')
+            )
+            for urun in urunler:
+                for field in Urun.SUPPLIER_SUMMARY_FIELDS:
+                    setattr(urun, field, getattr(urun, f'_{field}'))
+            Urun.objects.bulk_update(urunler, Urun.SUPPLIER_SUMMARY_FIELDS)
+        updated += len(urunler)
+        last_id = ids[-1]
+        if on_batch is not None:
+            on_batch(updated)
+    return updated
+
+
+@register('recompute_supplier_summary')
+def recompute_supplier_summary_job(job):
+    """Tedarikçi özet alanlarını tüm ürünler için yeniden hesaplar"""
+    job.report_progress(0, Urun.objects.count())
+    updated = recompute_supplier_summaries(
+        batch_size=job.params.get('batch_size', 500),
+        on_batch=job.report_progress,
+    )
+    return {'updated': updated}
+
+
+@register('reconcile_stock')
+def reconcile_stock_job(job):
+    """Urun.miktar değerini tedarikçi miktarlarının toplamına eşitler"""
+    product_ids = list(Urun.objects.order_by('id').values_list('id', flat=True))
+    job.report_progress(0, len(product_ids))
+    fixed = []
+    for done, product_id in enumerate(product_ids, start=1):
+        with transaction.atomic():
+            product = Urun.objects.select_for_update().get(id=product_id)
+            total = Supplier.objects.filter(urun=product).aggregate(
+                total=models.Sum('miktar')
+            )['total'] or 0
+            if product.miktar != total:
+                fixed.append({'id': product.id, 'from': product.miktar, 'to': total})
+                product.miktar = total
+                product.save(update_fields=['miktar', 'guncelleme_tarihi'])
+        if done % 100 == 0 or done == len(product_ids):
+            job.report_progress(done)
+    return {'checked': len(product_ids), 'fixed': fixed}
+
+
+@register('export_catalog')
+def export_catalog_job(job):
+    """Ürünleri tedarikçileriyle birlikte JSON Lines dosyasına yazar"""
+    export_dir = Path(settings.JOB_EXPORT_DIR)
+    export_dir.mkdir(parents=True, exist_ok=True)
+    path = export_dir / f'catalog-{job.pk}.jsonl'
+
+    batch_size = job.params.get('batch_size', 500)
+    job.report_progress(0, Urun.objects.count())
+    written = 0
+    last_id = 0
+    with path.open('w', encoding='utf-8') as fh:
+        while True:
+            products = list(
+                Urun.objects.filter(id__gt=last_id).order_by('id')
+                .values('id', 'ad', 'miktar', 'fiyat', *Urun.SUPPLIER_SUMMARY_FIELDS)[:batch_size]
+            )
+            if not products:
+                break
+            by_product = {product['id']: [] for product in products}
+            suppliers = Supplier.objects.filter(urun_id__in=by_product).order_by('id').values(
+                'id', 'urun_id', 'name', 'quality', 'lead_time', 'miktar', 'cost'
+            )
+            for supplier in suppliers:
+                by_product[supplier.pop('urun_id')].append(supplier)
+            for product in products:
+                product['suppliers'] = by_product[product['id']]
+                fh.write(json.dumps(product, default=str, ensure_ascii=False) + '\n')
+            written += len(products)
+            last_id = products[-1]['id']
+            job.report_progress(written)
+    return {'path': str(path), 'products': written}
+
+
+@register('import_urunler')
+def import_urunler_job(job):
+    """
+    ``params['items']`` içindeki ürünleri doğrulayıp toplu olarak ekler.
+    Her batch, ilerleme ile aynı transaction'da yazılır; iş yeniden
+    alınırsa ``progress_done`` kadar öğe atlanarak kaldığı yerden devam eder.
+    """
+    from .serializers import UrunSerializer
+
+    items = job.params.get('items', [])
+    batch_size = job.params.get('batch_size', 500)
+    done = job.progress_done
+    state = job.result or {'created': 0, 'errors': []}
+    job.report_progress(done, len(items))
+    for start in range(done, len(items), batch_size):
+        end = min(start + batch_size, len(items))
+        batch = []
+        errors = []
+        for index, item in enumerate(items[start:end], start=start):
+            serializer = UrunSerializer(data=item)
+            if serializer.is_valid():
+                batch.append(Urun(**serializer.validated_data))
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+        state = {
+            'created': state['created'] + len(batch),
+            'errors': state['errors'] + json.loads(json.dumps(errors)),
+        }
+        with transaction.atomic():
+            Urun.objects.bulk_create(batch)
+            owned = Job.objects.filter(
+                pk=job.pk, worker=job.worker, status=Job.STATUS_RUNNING
+            ).update(progress_done=end, result=state)
+            if not owned:
+                raise LeaseLost(f'Job {job.pk} was reassigned; batch {start}-{end} rolled back')
+        job.progress_done = end
+    return state
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from urunler.jobs import recompute_supplier_summaries
+
+
+class Command(BaseCommand):
+    help = "Mevcut ürünlerin tedarikçi özet alanlarını (en düşük maliyet, en kısa teslim süresi, tedarikçi sayısı) doldurur."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive')
+
+        updated = recompute_supplier_summaries(batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f'Supplier summary backfilled for {updated} products'))
@@ -0,0 +1,112 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Her settings modülü ayrı bir process içinde ölçülür; Django settings
+# bir process içinde yalnızca bir kez yapılandırılabilir.
+CHILD_SCRIPT = r'''
+import json, sys, time
+started = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+booted = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+routed = time.perf_counter()
+iterations = int(sys.argv[1])
+result = {
+    'setup_ms': (booted - started) * 1000,
+    'urlconf_ms': (routed - booted) * 1000,
+    'modules': len(sys.modules),
+}
+if not iterations:
+    json.dump(result, sys.stdout)
+    sys.exit(0)
+
+from django.core.handlers.base import BaseHandler
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+
+class MiddlewareOnlyHandler(BaseHandler):
+    """View yerine sabit bir cevap döner; yalnızca middleware zinciri ölçülür"""
+
+    def _get_response(self, request):
+        return HttpResponse(b'{}', content_type='application/json')
+
+
+handler = MiddlewareOnlyHandler()
+handler.load_middleware()
+factory = RequestFactory(HTTP_HOST='localhost', HTTP_ORIGIN='http://localhost:5173')
+for _ in range(min(iterations, 100)):
+    handler.get_response(factory.get('/api/urunler/'))
+elapsed = 0.0
+for _ in range(iterations):
+    request = factory.get('/api/urunler/')
+    t0 = time.perf_counter()
+    handler.get_response(request)
+    elapsed += time.perf_counter() - t0
+
+result['middleware_us'] = elapsed / iterations * 1e6
+json.dump(result, sys.stdout)
+'''
+
+
+class Command(BaseCommand):
+    help = (
+        "Varsayılan ve API-only worker profillerinin açılış süresini ve "
+        "istek başına middleware maliyetini karşılaştırır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--settings-modules', default='medjitapi.settings,medjitapi.settings_api',
+                            help='Virgülle ayrılmış settings modülleri')
+        parser.add_argument('--runs', type=int, default=5,
+                            help='Her profil için soğuk başlatma sayısı')
+        parser.add_argument('--iterations', type=int, default=5000,
+                            help='Middleware ölçümü için istek sayısı')
+
+    def handle(self, *args, **options):
+        modules = [module.strip() for module in options['settings_modules'].split(',') if module.strip()]
+        if not modules:
+            raise CommandError('--settings-modules cannot be empty')
+        if options['runs'] < 1 or options['iterations'] < 1:
+            raise CommandError('--runs and --iterations must be positive')
+
+        self.stdout.write(
+            f"{'settings':<28} {'boot ms':>9} {'setup ms':>9} {'urlconf ms':>11} "
+            f"{'modules':>8} {'mw us/req':>10}"
+        )
+        for module in modules:
+            samples = [self._measure(module, 0) for _ in range(options['runs'])]
+            middleware_us = self._measure(module, options['iterations'])['middleware_us']
+            self.stdout.write(
+                f"{module:<28} "
+                f"{statistics.median(s['boot_ms'] for s in samples):>9.1f} "
+                f"{statistics.median(s['setup_ms'] for s in samples):>9.1f} "
+                f"{statistics.median(s['urlconf_ms'] for s in samples):>11.1f} "
+                f"{statistics.median(s['modules'] for s in samples):>8.0f} "
+                f"{middleware_us:>10.1f}"
+            )
+
+    def _measure(self, module, iterations):
+        """Verilen settings ile yeni bir interpreter başlatır ve ölçümleri döner"""
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=module)
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-c', CHILD_SCRIPT, str(iterations)],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f'{module} failed to boot:\n{result.stderr}')
+        sample = json.loads(result.stdout)
+        # iterations=0 iken toplam süre, interpreter dahil soğuk başlatma süresidir
+        sample['boot_ms'] = (time.perf_counter() - started) * 1000
+        return sample
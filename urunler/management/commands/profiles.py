@@ -0,0 +1,48 @@
+import shutil
+import sys
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from urunler.profiling import list_profiles, profile_dir
+
+
+class Command(BaseCommand):
+    help = "SamplingProfilerMiddleware tarafından kaydedilen profilleri listeler veya indirir."
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['list', 'get', 'clear'])
+        parser.add_argument('name', nargs='?', help='get için profil dosyası adı')
+        parser.add_argument('--output', '-o', help='get: stdout yerine bu dosyaya yaz')
+        parser.add_argument('--limit', type=int, default=50, help='list: gösterilecek profil sayısı')
+
+    def handle(self, *args, **options):
+        directory = profile_dir()
+        profiles = list_profiles(directory)
+
+        if options['action'] == 'list':
+            if not profiles:
+                self.stdout.write(f'No profiles in {directory}')
+            for path in profiles[:options['limit']]:
+                stat = path.stat()
+                modified = datetime.fromtimestamp(stat.st_mtime).isoformat(timespec='seconds')
+                self.stdout.write(f'{path.name}  {stat.st_size:>9} B  {modified}')
+            return
+
+        if options['action'] == 'clear':
+            for path in profiles:
+                path.unlink()
+            self.stdout.write(self.style.SUCCESS(f'Removed {len(profiles)} profiles'))
+            return
+
+        if not options['name']:
+            raise CommandError('get requires a profile name')
+        matches = [path for path in profiles if path.name == options['name']]
+        if not matches:
+            raise CommandError(f"Profile {options['name']} not found in {directory}")
+        if options['output']:
+            shutil.copyfile(matches[0], options['output'])
+            self.stdout.write(self.style.SUCCESS(f"Saved to {options['output']}"))
+        else:
+            with matches[0].open('rb') as fh:
+                shutil.copyfileobj(fh, sys.stdout.buffer)
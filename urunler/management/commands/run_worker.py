@@ -0,0 +1,57 @@
+import os
+import signal
+import socket
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from urunler.jobs import claim_next, run_job
+
+
+class Command(BaseCommand):
+    help = "Veritabanındaki iş kuyruğunu işleyen arka plan worker'ını çalıştırır."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help='Kuyruk boşken bekleme süresi (saniye)')
+        parser.add_argument('--max-jobs', type=int, default=None,
+                            help='Bu kadar iş çalıştırdıktan sonra çık')
+        parser.add_argument('--burst', action='store_true',
+                            help='Kuyruk boşaldığında çık')
+
+    def handle(self, *args, **options):
+        if options['poll_interval'] <= 0:
+            raise CommandError('--poll-interval must be positive')
+
+        # Deploy sırasında gelen SIGTERM, Ctrl-C ile aynı yoldan işlenir:
+        # run_job çalışan işi kuyruğa geri koyar ve worker durur
+        signal.signal(signal.SIGTERM, _raise_interrupt)
+
+        worker = f'{socket.gethostname()}:{os.getpid()}'
+        processed = 0
+        self.stdout.write(f'Worker {worker} started')
+        try:
+            while options['max_jobs'] is None or processed < options['max_jobs']:
+                close_old_connections()
+                job = claim_next(worker)
+                if job is None:
+                    if options['burst']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                self.stdout.write(f'Running {job.kind} #{job.pk}')
+                job = run_job(job)
+                processed += 1
+                if job.status == job.STATUS_SUCCEEDED:
+                    self.stdout.write(self.style.SUCCESS(f'{job.kind} #{job.pk} succeeded'))
+                else:
+                    self.stderr.write(f'{job.kind} #{job.pk} failed')
+        except KeyboardInterrupt:
+            self.stderr.write(f'Worker {worker} interrupted')
+        self.stdout.write(f'Worker {worker} stopped after {processed} jobs')
+
+
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt
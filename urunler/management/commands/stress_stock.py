@@ -0,0 +1,266 @@
+import json
+import random
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+
+from urunler.models import Urun, Supplier
+
+
+STRESS_PREFIX = 'stress-'
+
+
+def _post_stock_update(url, product_id, supplier_id, quantity, timeout):
+    """Tek bir stock_updates isteği gönderir, (status, süre) döner"""
+    body = json.dumps({
+        'product_id': product_id,
+        'stock_updates': [{'supplier_id': supplier_id, 'quantity': quantity}],
+    }).encode('utf-8')
+    request = urllib.request.Request(
+        url, data=body, method='POST',
+        headers={'Content-Type': 'application/json'},
+    )
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            code = response.status
+    except urllib.error.HTTPError as exc:
+        exc.read()
+        code = exc.code
+    except (urllib.error.URLError, OSError):
+        code = 0
+    return code, time.perf_counter() - started
+
+
+def _run_batch(url, jobs, threads, timeout):
+    """
+    Bir iş listesini thread havuzu ile çalıştırır.
+    Process havuzundan da çağrıldığı için modül seviyesinde tanımlıdır.
+    """
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [
+            pool.submit(_post_stock_update, url, product_id, supplier_id, quantity, timeout)
+            for product_id, supplier_id, quantity in jobs
+        ]
+        return [
+            (job[1], job[2], *future.result())
+            for job, future in zip(jobs, futures)
+        ]
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "UpdateStockView'a çalışan bir sunucu üzerinden eşzamanlı stock_updates "
+        "istekleri gönderir; stok tutarlılığını doğrular, throughput ve gecikme raporlar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://localhost:8000',
+                            help='Hedef sunucu adresi')
+        parser.add_argument('--products', type=int, default=5)
+        parser.add_argument('--suppliers-per-product', type=int, default=4)
+        parser.add_argument('--initial-stock', type=int, default=500,
+                            help='Her tedarikçinin başlangıç miktarı')
+        parser.add_argument('--requests', type=int, default=2000,
+                            help='Her eşzamanlılık seviyesi için istek sayısı')
+        parser.add_argument('--concurrency', default='1,8,32,64',
+                            help='Virgülle ayrılmış thread sayıları')
+        parser.add_argument('--processes', type=int, default=1,
+                            help='İstemci process sayısı; her biri --concurrency kadar thread açar')
+        parser.add_argument('--max-quantity', type=int, default=3)
+        parser.add_argument('--timeout', type=float, default=30.0)
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument('--keep', action='store_true',
+                            help='Test verisini sonunda silme')
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(level) for level in options['concurrency'].split(',') if level.strip()]
+        except ValueError:
+            raise CommandError('--concurrency must be a comma separated list of integers')
+        if not levels or min(levels) < 1:
+            raise CommandError('--concurrency values must be positive')
+        if options['processes'] < 1:
+            raise CommandError('--processes must be positive')
+
+        rng = random.Random(options['seed'])
+        url = options['base_url'].rstrip('/') + '/api/urunler/update-stock/'
+
+        self._cleanup()
+        products = self._seed(options)
+        targets = [
+            (product.id, supplier_id)
+            for product, supplier_ids in products
+            for supplier_id in supplier_ids
+        ]
+        failure = None
+
+        try:
+            self.stdout.write(
+                f"{'threads':>8} {'procs':>6} {'ok':>7} {'rejected':>8} {'err':>5} "
+                f"{'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+            )
+            for threads in levels:
+                # Her seviye dolu stokla başlar; aksi halde yüksek eşzamanlılık
+                # seviyeleri çoğunlukla ucuz 400 reddini ölçer
+                self._reset(products, options)
+                accepted = {supplier_id: 0 for _, supplier_id in targets}
+                # Zaman aşımına uğrayan istekler sunucuda commit edilmiş olabilir
+                unknown = {supplier_id: 0 for _, supplier_id in targets}
+                jobs = [
+                    (*rng.choice(targets), rng.randint(1, options['max_quantity']))
+                    for _ in range(options['requests'])
+                ]
+                results, elapsed = self._fire(url, jobs, threads, options)
+                ok, errors = self._report(threads, options['processes'], results, elapsed)
+                for supplier_id, quantity, code, _ in results:
+                    if code == 200:
+                        accepted[supplier_id] += quantity
+                    elif code == 0:
+                        unknown[supplier_id] += quantity
+                if not self._verify(products, accepted, unknown, options['initial_stock']):
+                    failure = 'Stock accounting invariants violated'
+                    break
+                if errors:
+                    failure = f'{errors} requests at {threads} threads failed with transport or server errors'
+                    break
+                if not ok:
+                    failure = f'No stock update succeeded at {threads} threads'
+                    break
+        finally:
+            if not options['keep']:
+                self._cleanup()
+
+        if failure:
+            raise CommandError(failure)
+        self.stdout.write(self.style.SUCCESS('All stock invariants held'))
+
+    def _seed(self, options):
+        """Test ürünlerini ve tedarikçilerini oluşturur"""
+        products = []
+        with transaction.atomic():
+            for i in range(options['products']):
+                urun = Urun.objects.create(
+                    ad=f'{STRESS_PREFIX}urun-{i}',
+                    miktar=options['initial_stock'] * options['suppliers_per_product'],
+                    fiyat=Decimal('10.00'),
+                )
+                supplier_ids = [
+                    Supplier.objects.create(
+                        name=f'{STRESS_PREFIX}supplier-{i}-{j}',
+                        quality='A',
+                        lead_time=j + 1,
+                        urun=urun,
+                        miktar=options['initial_stock'],
+                        cost=Decimal('5.00') + j,
+                    ).id
+                    for j in range(options['suppliers_per_product'])
+                ]
+                urun.refresh_supplier_summary()
+                products.append((urun, supplier_ids))
+        return products
+
+    def _reset(self, products, options):
+        """Test tedarikçilerinin ve ürünlerinin miktarını başlangıç değerine döndürür"""
+        with transaction.atomic():
+            for urun, supplier_ids in products:
+                Supplier.objects.filter(id__in=supplier_ids).update(miktar=options['initial_stock'])
+                Urun.objects.filter(id=urun.id).update(
+                    miktar=options['initial_stock'] * len(supplier_ids)
+                )
+
+    def _cleanup(self):
+        Urun.objects.filter(ad__startswith=STRESS_PREFIX).delete()
+
+    def _fire(self, url, jobs, threads, options):
+        processes = options['processes']
+        started = time.perf_counter()
+        if processes == 1:
+            results = _run_batch(url, jobs, threads, options['timeout'])
+        else:
+            chunks = [jobs[i::processes] for i in range(processes)]
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                futures = [
+                    pool.submit(_run_batch, url, chunk, threads, options['timeout'])
+                    for chunk in chunks
+                ]
+                results = [row for future in futures for row in future.result()]
+        return results, time.perf_counter() - started
+
+    def _report(self, threads, processes, results, elapsed):
+        ok = sum(1 for row in results if row[2] == 200)
+        rejected = sum(1 for row in results if row[2] == 400)
+        errors = len(results) - ok - rejected
+        latencies = sorted(row[3] * 1000 for row in results)
+        self.stdout.write(
+            f'{threads:>8} {processes:>6} {ok:>7} {rejected:>8} {errors:>5} '
+            f'{len(results) / elapsed if elapsed else 0:>9.1f} '
+            f'{_percentile(latencies, 0.50):>8.1f} {_percentile(latencies, 0.95):>8.1f} '
+            f'{_percentile(latencies, 0.99):>8.1f} {latencies[-1] if latencies else 0:>8.1f}'
+        )
+        timeouts = sum(1 for row in results if row[2] == 0)
+        if errors:
+            self.stderr.write(
+                f'  {errors} requests failed with transport or server errors '
+                f'({timeouts} without a response)'
+            )
+        return ok, errors
+
+    def _verify(self, products, accepted, unknown, initial_stock):
+        """
+        Tedarikçi ve ürün miktarlarının tutarlı olduğunu kontrol eder.
+        Cevabı alınamayan isteklerin miktarı (``unknown``) uygulanmış ya da
+        uygulanmamış olabileceği için kabul edilebilir aralık olarak sayılır.
+        """
+        ok = True
+        for urun, supplier_ids in products:
+            suppliers = dict(
+                Supplier.objects.filter(id__in=supplier_ids).values_list('id', 'miktar')
+            )
+            for supplier_id in supplier_ids:
+                miktar = suppliers[supplier_id]
+                expected = initial_stock - accepted[supplier_id]
+                lowest = expected - unknown[supplier_id]
+                if miktar < 0:
+                    ok = False
+                    self.stderr.write(f'  supplier {supplier_id}: negative miktar {miktar}')
+                if miktar > expected:
+                    ok = False
+                    self.stderr.write(
+                        f'  supplier {supplier_id}: miktar {miktar}, expected {expected} '
+                        f'({miktar - expected} lost decrements)'
+                    )
+                elif miktar < lowest:
+                    ok = False
+                    self.stderr.write(
+                        f'  supplier {supplier_id}: miktar {miktar}, expected at least {lowest} '
+                        f'({lowest - miktar} unaccounted decrements)'
+                    )
+                elif unknown[supplier_id]:
+                    self.stderr.write(
+                        f'  supplier {supplier_id}: {expected - miktar} of '
+                        f'{unknown[supplier_id]} units from unanswered requests were applied'
+                    )
+            total = Supplier.objects.filter(urun_id=urun.id).aggregate(
+                total=models.Sum('miktar')
+            )['total'] or 0
+            urun_miktar = Urun.objects.values_list('miktar', flat=True).get(id=urun.id)
+            if urun_miktar != total:
+                ok = False
+                self.stderr.write(
+                    f'  urun {urun.id}: miktar {urun_miktar} != supplier sum {total}'
+                )
+        return ok
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.10 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('urunler', '0003_supplier_miktar'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='urun',
+            name='min_supplier_cost',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Cheapest supplier cost', max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='urun',
+            name='min_lead_time',
+            field=models.PositiveIntegerField(blank=True, help_text='Shortest supplier lead time in days', null=True),
+        ),
+        migrations.AddField(
+            model_name='urun',
+            name='supplier_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.10 on 2026-10-19 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('urunler', '0004_urun_supplier_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(help_text='Registered job handler name', max_length=100)),
+                ('params', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], db_index=True, default='queued', max_length=20)),
+                ('progress_done', models.PositiveIntegerField(default=0)),
+                ('progress_total', models.PositiveIntegerField(blank=True, null=True)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('worker', models.CharField(blank=True, help_text='Worker that claimed this job', max_length=200)),
+                ('olusturma_tarihi', models.DateTimeField(auto_now_add=True)),
+                ('baslama_tarihi', models.DateTimeField(blank=True, null=True)),
+                ('bitis_tarihi', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-olusturma_tarihi'],
+                'indexes': [models.Index(fields=['status', 'id'], name='urunler_job_status_id_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('urunler', '0005_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='son_sinyal_tarihi',
+            field=models.DateTimeField(blank=True, help_text='Last heartbeat from the worker running this job', null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -7,6 +7,12 @@ class Urun(models.Model):
     fiyat = models.DecimalField(max_digits=10, decimal_places=2)
     olusturma_tarihi = models.DateTimeField(auto_now_add=True)
     guncelleme_tarihi = models.DateTimeField(auto_now=True)
+    # Tedarikçi özet alanları; Supplier yazma yollarında güncel tutulur
+    min_supplier_cost = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, help_text="Cheapest supplier cost")
+    min_lead_time = models.PositiveIntegerField(null=True, blank=True, help_text="Shortest supplier lead time in days")
+    supplier_count = models.PositiveIntegerField(default=0)
+
+    SUPPLIER_SUMMARY_FIELDS = ['min_supplier_cost', 'min_lead_time', 'supplier_count']
 
     class Meta:
         ordering = ['-olusturma_tarihi']
@@ -14,6 +20,27 @@ class Urun(models.Model):
     def __str__(self):
         return self.ad
 
+    @staticmethod
+    def supplier_summary_aggregates(prefix=''):
+        """Özet alanlarını hesaplayan aggregate ifadelerini döner"""
+        return {
+            'min_supplier_cost': models.Min(f'{prefix}cost'),
+            'min_lead_time': models.Min(f'{prefix}lead_time'),
+            'supplier_count': models.Count(f'{prefix}id'),
+        }
+
+    def refresh_supplier_summary(self, save=True):
+        """
+        Tedarikçi özet alanlarını yeniden hesaplar.
+        Eşzamanlı yazmalarda tutarlılık için transaction içinde ve ürün
+        satırı select_for_update ile kilitlenmişken çağrılmalıdır.
+        """
+        summary = self.suppliers.aggregate(**self.supplier_summary_aggregates())
+        for field in self.SUPPLIER_SUMMARY_FIELDS:
+            setattr(self, field, summary[field])
+        if save:
+            self.save(update_fields=self.SUPPLIER_SUMMARY_FIELDS + ['guncelleme_tarihi'])
+
 
 class Supplier(models.Model):
     name = models.CharField(max_length=200)
@@ -30,3 +57,49 @@ class Supplier(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class Job(models.Model):
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=100, help_text="Registered job handler name")
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED, db_index=True)
+    progress_done = models.PositiveIntegerField(default=0)
+    progress_total = models.PositiveIntegerField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    worker = models.CharField(max_length=200, blank=True, help_text="Worker that claimed this job")
+    olusturma_tarihi = models.DateTimeField(auto_now_add=True)
+    baslama_tarihi = models.DateTimeField(null=True, blank=True)
+    bitis_tarihi = models.DateTimeField(null=True, blank=True)
+    son_sinyal_tarihi = models.DateTimeField(null=True, blank=True, help_text="Last heartbeat from the worker running this job")
+    attempts = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-olusturma_tarihi']
+        indexes = [
+            models.Index(fields=['status', 'id'], name='urunler_job_status_id_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} #{self.pk} ({self.status})'
+
+    def report_progress(self, done, total=None):
+        """İlerlemeyi günceller; yalnızca ilerleme alanları yazılır"""
+        self.progress_done = done
+        if total is not None:
+            self.progress_total = total
+        Job.objects.filter(pk=self.pk).update(
+            progress_done=self.progress_done,
+            progress_total=self.progress_total,
+        )
@@ -0,0 +1,210 @@
+"""
+İsteğe bağlı, örneklemeli istek profilleyici.
+
+``SamplingProfilerMiddleware`` isteklerin ``PROFILER_SAMPLE_RATE`` kadarını
+ya da ``X-Profile`` header'ı ``PROFILER_TOKEN`` ile eşleşen istekleri
+profiller. Profil süresince ayrı bir thread, isteği işleyen thread'in
+stack'ini ``PROFILER_INTERVAL`` aralıklarla okur; sonuç view, serializer
+ve render fazlarına ayrılarak ``PROFILER_DIR`` altına collapsed-stack ya
+da speedscope dosyası olarak yazılır. GIL nedeniyle örnekler aralıktan
+seyrek gelebildiği için her örnek, bir öncekinden bu yana geçen süre
+(mikrosaniye) ile ağırlıklandırılır.
+
+Ayarlar tanımlı değilse middleware kendini zincirden çıkarır. Dizinde en
+fazla ``PROFILER_MAX_FILES`` profil tutulur; yazarken en eskiler silinir.
+Profil yazılamazsa hata loglanır, istek etkilenmez.
+"""
+import hmac
+import json
+import logging
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_SUFFIXES = {
+    'collapsed': '.collapsed.txt',
+    'speedscope': '.speedscope.json',
+}
+
+# Dosya yolu parçası -> faz; ilk eşleşen kazanır
+PHASE_MARKERS = [
+    ('rest_framework/renderers', 'render'),
+    ('django/template', 'render'),
+    ('rest_framework/serializers', 'serializer'),
+    ('rest_framework/fields', 'serializer'),
+    ('rest_framework/relations', 'serializer'),
+]
+
+
+def profile_dir():
+    return Path(getattr(settings, 'PROFILER_DIR', settings.BASE_DIR / 'profiles'))
+
+
+def list_profiles(directory=None):
+    """Kayıtlı profil dosyalarını en yeniden eskiye sıralı döner"""
+    directory = directory or profile_dir()
+    if not directory.exists():
+        return []
+    suffixes = tuple(PROFILE_SUFFIXES.values())
+    return sorted(
+        (path for path in directory.iterdir() if path.name.endswith(suffixes)),
+        key=lambda path: path.name,
+        reverse=True,
+    )
+
+
+def prune_profiles(max_files, directory=None):
+    """En yeni ``max_files`` profil dışındakileri siler"""
+    for path in list_profiles(directory)[max_files:]:
+        path.unlink(missing_ok=True)
+
+
+def _frame_label(code):
+    return f'{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})'
+
+
+def _phase(codes):
+    for code in codes:
+        filename = code.co_filename.replace('\\', '/')
+        for marker, phase in PHASE_MARKERS:
+            if marker in filename:
+                return phase
+    return 'view'
+
+
+class StackSampler(threading.Thread):
+    """
+    Hedef thread'in stack'ini ``root`` frame'inin altından örnekler.
+    ``samples`` stack -> toplam mikrosaniye tutar.
+    """
+
+    def __init__(self, target_thread_id, root, interval):
+        super().__init__(name='request-profiler', daemon=True)
+        self.target_thread_id = target_thread_id
+        self.root = root
+        self.interval = interval
+        self.samples = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        previous = time.perf_counter()
+        while not self._stop_event.wait(self.interval):
+            now = time.perf_counter()
+            elapsed_us = int((now - previous) * 1e6)
+            previous = now
+            frame = sys._current_frames().get(self.target_thread_id)
+            codes = []
+            while frame is not None and frame is not self.root:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            if frame is None or not codes:
+                continue
+            codes.reverse()
+            stack = (_phase(codes),) + tuple(_frame_label(code) for code in codes)
+            self.samples[stack] += elapsed_us
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def write_collapsed(path, samples):
+    with path.open('w', encoding='utf-8') as fh:
+        for stack, weight in samples.most_common():
+            fh.write(f"{';'.join(stack)} {weight}\n")
+
+
+def write_speedscope(path, samples, name, duration):
+    frames = []
+    index = {}
+    profile_samples = []
+    weights = []
+    for stack, weight in samples.items():
+        indices = []
+        for label in stack:
+            if label not in index:
+                index[label] = len(frames)
+                frames.append({'name': label})
+            indices.append(index[label])
+        profile_samples.append(indices)
+        weights.append(weight / 1000)
+    document = {
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'shared': {'frames': frames},
+        'profiles': [{
+            'type': 'sampled',
+            'name': name,
+            'unit': 'milliseconds',
+            'startValue': 0,
+            'endValue': duration * 1000,
+            'samples': profile_samples,
+            'weights': weights,
+        }],
+        'name': name,
+        'exporter': 'medjitapi',
+    }
+    path.write_text(json.dumps(document), encoding='utf-8')
+
+
+class SamplingProfilerMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = float(getattr(settings, 'PROFILER_SAMPLE_RATE', 0.0))
+        self.token = getattr(settings, 'PROFILER_TOKEN', None)
+        self.interval = float(getattr(settings, 'PROFILER_INTERVAL', 0.001))
+        self.format = getattr(settings, 'PROFILER_FORMAT', 'collapsed')
+        self.max_files = getattr(settings, 'PROFILER_MAX_FILES', 200)
+        if self.format not in PROFILE_SUFFIXES:
+            raise ValueError(f'PROFILER_FORMAT must be one of {", ".join(PROFILE_SUFFIXES)}')
+        if self.sample_rate <= 0 and not self.token:
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        if not self._should_profile(request):
+            return self.get_response(request)
+
+        sampler = StackSampler(threading.get_ident(), sys._getframe(), self.interval)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            sampler.stop()
+        try:
+            self._save(request, response, sampler.samples, time.perf_counter() - started)
+        except OSError:
+            logger.exception('Could not save profile for %s %s', request.method, request.path)
+        return response
+
+    def _should_profile(self, request):
+        header = request.META.get(PROFILE_HEADER)
+        if header is not None and self.token and hmac.compare_digest(header.encode(), self.token.encode()):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _save(self, request, response, samples, duration):
+        directory = profile_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', request.path).strip('-') or 'root'
+        name = (
+            f"{timezone.now().strftime('%Y%m%dT%H%M%S%f')}-{request.method}-{slug}"
+            f"-{response.status_code}-{duration * 1000:.0f}ms"
+        )
+        path = directory / (name + PROFILE_SUFFIXES[self.format])
+        if self.format == 'speedscope':
+            write_speedscope(path, samples, f'{request.method} {request.path}', duration)
+        else:
+            write_collapsed(path, samples)
+        if self.max_files:
+            prune_profiles(self.max_files, directory)
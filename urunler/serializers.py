@@ -1,12 +1,22 @@
 from rest_framework import serializers
-from .models import Urun, Supplier
+from .models import Urun, Supplier, Job
 
 
 class UrunSerializer(serializers.ModelSerializer):
     class Meta:
         model = Urun
-        fields = ['id', 'ad', 'miktar', 'fiyat', 'olusturma_tarihi', 'guncelleme_tarihi']
-        read_only_fields = ['id', 'olusturma_tarihi', 'guncelleme_tarihi']
+        fields = ['id', 'ad', 'miktar', 'fiyat', 'min_supplier_cost', 'min_lead_time', 'supplier_count', 'olusturma_tarihi', 'guncelleme_tarihi']
+        read_only_fields = ['id', 'min_supplier_cost', 'min_lead_time', 'supplier_count', 'olusturma_tarihi', 'guncelleme_tarihi']
+
+    def update(self, instance, validated_data):
+        """
+        Yalnızca gönderilen alanları kaydeder; tedarikçi özet alanları
+        kilitli Supplier yazma yollarında güncellendiği için burada yazılmaz
+        """
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=list(validated_data) + ['guncelleme_tarihi'])
+        return instance
 
 
 class SupplierSerializer(serializers.ModelSerializer):
@@ -20,3 +30,46 @@ class SupplierSerializer(serializers.ModelSerializer):
         model = Supplier
         fields = ['id', 'name', 'quality', 'lead_time', 'urun', 'urun_detail', 'miktar', 'cost', 'olusturma_tarihi', 'guncelleme_tarihi']
         read_only_fields = ['id', 'olusturma_tarihi', 'guncelleme_tarihi', 'urun_detail']
+
+    def update(self, instance, validated_data):
+        """
+        Yalnızca gönderilen alanları kaydeder; örneğin sadece cost içeren bir
+        PATCH, eşzamanlı UpdateStockView düşüşünü eski miktar ile ezmez
+        """
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=list(validated_data) + ['guncelleme_tarihi'])
+        return instance
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = ['id', 'kind', 'params', 'status', 'progress_done', 'progress_total', 'result', 'error', 'olusturma_tarihi', 'baslama_tarihi', 'bitis_tarihi']
+        read_only_fields = ['id', 'status', 'progress_done', 'progress_total', 'result', 'error', 'olusturma_tarihi', 'baslama_tarihi', 'bitis_tarihi']
+
+    def validate_kind(self, value):
+        # İş modülü (handler'lar) API worker'larının açılışında yüklenmesin diye
+        # ilk iş oluşturulurken import edilir
+        from .jobs import JOB_HANDLERS
+        if value not in JOB_HANDLERS:
+            raise serializers.ValidationError(f'Unknown job kind. Available: {", ".join(sorted(JOB_HANDLERS))}')
+        return value
+
+    def validate_params(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError('params must be an object')
+        batch_size = value.get('batch_size')
+        if batch_size is not None and (
+            isinstance(batch_size, bool) or not isinstance(batch_size, int) or batch_size < 1
+        ):
+            raise serializers.ValidationError({'batch_size': 'batch_size must be a positive integer'})
+        return value
+
+    def validate(self, attrs):
+        params = attrs.get('params', {})
+        if attrs.get('kind') == 'import_urunler':
+            items = params.get('items')
+            if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+                raise serializers.ValidationError({'params': {'items': 'items must be a list of objects'}})
+        return attrs
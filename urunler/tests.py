@@ -0,0 +1,315 @@
+import json
+import tempfile
+import time
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
+
+from django.db import OperationalError
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import jobs
+from .models import Job, Urun, Supplier
+from .profiling import SamplingProfilerMiddleware, list_profiles
+
+
+class JobClaimTests(TestCase):
+    def test_claims_oldest_queued_job(self):
+        first = jobs.enqueue('reconcile_stock')
+        jobs.enqueue('reconcile_stock')
+
+        job = jobs.claim_next('w1')
+
+        self.assertEqual(job.pk, first.pk)
+        self.assertEqual(job.status, Job.STATUS_RUNNING)
+        self.assertEqual(job.worker, 'w1')
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.son_sinyal_tarihi)
+
+    def test_returns_none_when_queue_is_empty(self):
+        jobs.enqueue('reconcile_stock')
+        jobs.claim_next('w1')
+
+        self.assertIsNone(jobs.claim_next('w2'))
+
+    def test_running_job_with_fresh_heartbeat_is_not_reclaimed(self):
+        jobs.enqueue('reconcile_stock')
+        jobs.claim_next('w1')
+
+        self.assertIsNone(jobs.claim_next('w2'))
+
+    @override_settings(JOB_LEASE_TIMEOUT=60)
+    def test_reclaims_running_job_with_stale_heartbeat(self):
+        job = jobs.enqueue('reconcile_stock')
+        jobs.claim_next('w1')
+        Job.objects.filter(pk=job.pk).update(son_sinyal_tarihi=timezone.now() - timedelta(seconds=120))
+
+        reclaimed = jobs.claim_next('w2')
+
+        self.assertEqual(reclaimed.pk, job.pk)
+        self.assertEqual(reclaimed.worker, 'w2')
+        self.assertEqual(reclaimed.attempts, 2)
+
+    @override_settings(JOB_LEASE_TIMEOUT=60, JOB_MAX_ATTEMPTS=2)
+    def test_stale_job_fails_after_max_attempts(self):
+        job = jobs.enqueue('reconcile_stock')
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.STATUS_RUNNING,
+            worker='w1',
+            attempts=2,
+            son_sinyal_tarihi=timezone.now() - timedelta(seconds=120),
+        )
+
+        self.assertIsNone(jobs.claim_next('w2'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertIn('too many times', job.error)
+
+    @override_settings(JOB_LEASE_TIMEOUT=60)
+    def test_stale_job_of_non_retryable_kind_is_failed(self):
+        jobs.register('one_shot', retryable=False)(lambda job: {})
+        self.addCleanup(jobs.JOB_HANDLERS.pop, 'one_shot')
+        job = jobs.enqueue('one_shot')
+        jobs.claim_next('w1')
+        Job.objects.filter(pk=job.pk).update(son_sinyal_tarihi=timezone.now() - timedelta(seconds=120))
+
+        self.assertIsNone(jobs.claim_next('w2'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+
+
+class RunJobTests(TestCase):
+    def test_finish_is_skipped_after_job_is_reassigned(self):
+        jobs.enqueue('reconcile_stock')
+        job = jobs.claim_next('w1')
+        Job.objects.filter(pk=job.pk).update(worker='w2')
+
+        jobs.run_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_RUNNING)
+        self.assertEqual(job.worker, 'w2')
+
+    def test_failed_handler_records_traceback(self):
+        jobs.enqueue('import_urunler', {'items': [], 'batch_size': 'x'})
+        with self.assertLogs('urunler.jobs', 'ERROR'):
+            job = jobs.run_job(jobs.claim_next('w1'))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertIn('Traceback', job.error)
+
+    def test_interrupt_requeues_retryable_job(self):
+        jobs.register('interruptible')(_interrupted)
+        self.addCleanup(jobs.JOB_HANDLERS.pop, 'interruptible')
+        jobs.enqueue('interruptible')
+        job = jobs.claim_next('w1')
+
+        with self.assertRaises(KeyboardInterrupt):
+            jobs.run_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_QUEUED)
+        self.assertEqual(job.worker, '')
+        self.assertIsNone(job.son_sinyal_tarihi)
+        self.assertEqual(job.attempts, 0)
+
+    def test_interrupt_fails_non_retryable_job(self):
+        jobs.register('one_shot', retryable=False)(lambda job: _interrupted(job))
+        self.addCleanup(jobs.JOB_HANDLERS.pop, 'one_shot')
+        jobs.enqueue('one_shot')
+        job = jobs.claim_next('w1')
+
+        with self.assertRaises(KeyboardInterrupt):
+            jobs.run_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+
+
+def _interrupted(job):
+    raise KeyboardInterrupt
+
+
+class HeartbeatTests(TestCase):
+    @override_settings(JOB_HEARTBEAT_INTERVAL=0.01)
+    def test_survives_database_errors(self):
+        jobs.enqueue('reconcile_stock')
+        job = jobs.claim_next('w1')
+        calls = []
+
+        def beat():
+            calls.append(1)
+            if len(calls) == 1:
+                raise OperationalError('database is locked')
+
+        heartbeat = jobs.Heartbeat(job)
+        with mock.patch.object(heartbeat, 'beat', side_effect=beat), \
+                self.assertLogs('urunler.jobs', 'ERROR'):
+            heartbeat.start()
+            deadline = time.monotonic() + 2
+            while len(calls) < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(heartbeat.is_alive())
+            heartbeat.stop()
+
+        self.assertGreaterEqual(len(calls), 3)
+
+
+class JobHandlerTests(TestCase):
+    def setUp(self):
+        self.urun = Urun.objects.create(ad='a', miktar=99, fiyat=Decimal('10.00'))
+        for cost, lead_time, miktar in [(Decimal('5.00'), 3, 10), (Decimal('4.00'), 7, 5)]:
+            Supplier.objects.create(
+                name='s', quality='A', lead_time=lead_time, urun=self.urun, miktar=miktar, cost=cost,
+            )
+
+    def run_kind(self, kind, params=None):
+        jobs.enqueue(kind, params)
+        job = jobs.run_job(jobs.claim_next('w1'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_SUCCEEDED, job.error)
+        return job
+
+    def test_reconcile_stock(self):
+        job = self.run_kind('reconcile_stock')
+
+        self.assertEqual(job.result, {
+            'checked': 1,
+            'fixed': [{'id': self.urun.id, 'from': 99, 'to': 15}],
+        })
+        self.urun.refresh_from_db()
+        self.assertEqual(self.urun.miktar, 15)
+
+    def test_recompute_supplier_summary(self):
+        job = self.run_kind('recompute_supplier_summary')
+
+        self.assertEqual(job.result, {'updated': 1})
+        self.urun.refresh_from_db()
+        self.assertEqual(self.urun.min_supplier_cost, Decimal('4.00'))
+        self.assertEqual(self.urun.min_lead_time, 3)
+        self.assertEqual(self.urun.supplier_count, 2)
+
+    def test_export_catalog(self):
+        with tempfile.TemporaryDirectory() as export_dir, override_settings(JOB_EXPORT_DIR=export_dir):
+            job = self.run_kind('export_catalog')
+
+            self.assertEqual(job.result['products'], 1)
+            lines = Path(job.result['path']).read_text(encoding='utf-8').splitlines()
+        product = json.loads(lines[0])
+        self.assertEqual(product['id'], self.urun.id)
+        self.assertEqual(len(product['suppliers']), 2)
+
+    def test_import_urunler(self):
+        items = [
+            {'ad': 'imp1', 'miktar': 1, 'fiyat': '1.00'},
+            {'ad': 'imp2', 'miktar': -1, 'fiyat': '1.00'},
+            {'ad': 'imp3', 'miktar': 3, 'fiyat': '1.00'},
+        ]
+        job = self.run_kind('import_urunler', {'items': items, 'batch_size': 2})
+
+        self.assertEqual(job.result['created'], 2)
+        self.assertEqual([error['index'] for error in job.result['errors']], [1])
+        self.assertEqual(job.progress_done, 3)
+        self.assertEqual(Urun.objects.filter(ad__startswith='imp').count(), 2)
+
+    @override_settings(JOB_LEASE_TIMEOUT=60)
+    def test_reclaimed_import_resumes_after_committed_batches(self):
+        items = [{'ad': f'imp{i}', 'miktar': i, 'fiyat': '1.00'} for i in range(4)]
+        job = jobs.enqueue('import_urunler', {'items': items, 'batch_size': 2})
+        jobs.claim_next('w1')
+        # w1 ilk batch'i yazdıktan sonra öldü
+        Urun.objects.bulk_create([Urun(ad=item['ad'], miktar=item['miktar'], fiyat=Decimal('1.00')) for item in items[:2]])
+        Job.objects.filter(pk=job.pk).update(
+            progress_done=2,
+            result={'created': 2, 'errors': []},
+            son_sinyal_tarihi=timezone.now() - timedelta(seconds=120),
+        )
+
+        job = jobs.run_job(jobs.claim_next('w2'))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_SUCCEEDED)
+        self.assertEqual(job.result['created'], 4)
+        self.assertEqual(Urun.objects.filter(ad__startswith='imp').count(), 4)
+
+
+class JobApiTests(TestCase):
+    def test_create_returns_202_with_location(self):
+        response = self.client.post(
+            reverse('job-create'), {'kind': 'reconcile_stock'},
+            content_type='application/json', HTTP_HOST='localhost',
+        )
+
+        self.assertEqual(response.status_code, 202)
+        job = Job.objects.get()
+        self.assertEqual(response['Location'], reverse('job-detail', kwargs={'pk': job.pk}))
+        self.assertEqual(job.status, Job.STATUS_QUEUED)
+
+    def test_status_endpoint(self):
+        job = jobs.enqueue('reconcile_stock')
+
+        response = self.client.get(reverse('job-detail', kwargs={'pk': job.pk}), HTTP_HOST='localhost')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['status'], Job.STATUS_QUEUED)
+
+    def test_invalid_params_are_rejected(self):
+        for body in [
+            {'kind': 'unknown'},
+            {'kind': 'import_urunler', 'params': [1, 2]},
+            {'kind': 'import_urunler', 'params': {'items': 'x'}},
+            {'kind': 'reconcile_stock', 'params': {'batch_size': 0}},
+            {'kind': 'reconcile_stock', 'params': {'batch_size': 'x'}},
+        ]:
+            with self.subTest(body=body):
+                response = self.client.post(
+                    reverse('job-create'), body, content_type='application/json', HTTP_HOST='localhost',
+                )
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(Job.objects.exists())
+
+
+class SamplingProfilerMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.profile_dir = Path(temp_dir.name)
+        overrides = override_settings(
+            PROFILER_SAMPLE_RATE=0.0, PROFILER_TOKEN='secret', PROFILER_DIR=self.profile_dir,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def call(self, middleware, **headers):
+        return middleware(RequestFactory().get('/api/urunler/', **headers))
+
+    def test_profiles_request_with_matching_token(self):
+        middleware = SamplingProfilerMiddleware(lambda request: HttpResponse('ok'))
+
+        self.call(middleware, HTTP_X_PROFILE='wrong')
+        self.assertEqual(list_profiles(self.profile_dir), [])
+        self.call(middleware, HTTP_X_PROFILE='secret')
+        self.assertEqual(len(list_profiles(self.profile_dir)), 1)
+
+    def test_save_errors_do_not_fail_the_request(self):
+        middleware = SamplingProfilerMiddleware(lambda request: HttpResponse('ok'))
+
+        with mock.patch('urunler.profiling.write_collapsed', side_effect=OSError('read-only')), \
+                self.assertLogs('urunler.profiling', 'ERROR'):
+            response = self.call(middleware, HTTP_X_PROFILE='secret')
+
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(PROFILER_MAX_FILES=2)
+    def test_keeps_only_newest_profiles(self):
+        middleware = SamplingProfilerMiddleware(lambda request: HttpResponse('ok'))
+
+        for _ in range(4):
+            self.call(middleware, HTTP_X_PROFILE='secret')
+
+        self.assertEqual(len(list_profiles(self.profile_dir)), 2)
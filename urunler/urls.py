@@ -8,4 +8,6 @@ urlpatterns = [
     path('suppliers/', views.SupplierListCreateView.as_view(), name='supplier-list-create'),
     path('suppliers/<int:pk>/', views.SupplierRetrieveUpdateDestroyView.as_view(), name='supplier-detail'),
     path('update-stock/', views.UpdateStockView.as_view(), name='update-stock'),
+    path('jobs/', views.JobCreateView.as_view(), name='job-create'),
+    path('jobs/<int:pk>/', views.JobRetrieveView.as_view(), name='job-detail'),
 ]
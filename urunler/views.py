@@ -2,9 +2,47 @@ from rest_framework import generics
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
-from django.db import models
-from .models import Urun, Supplier
-from .serializers import UrunSerializer, SupplierSerializer
+from django.urls import reverse
+from django.db import models, transaction
+from .models import Urun, Supplier, Job
+from .serializers import UrunSerializer, SupplierSerializer, JobSerializer
+
+
+def _lock_urunler(urun_ids):
+    """Ürün satırlarını id sırasıyla kilitler; id -> Urun sözlüğü döner"""
+    urunler = Urun.objects.select_for_update().filter(id__in=set(urun_ids)).order_by('id')
+    return {urun.id: urun for urun in urunler}
+
+
+def save_supplier(serializer, previous_urun_id=None):
+    """
+    Supplier'ı kaydeder ve etkilenen ürünlerin tedarikçi özetlerini
+    aynı transaction içinde günceller
+    """
+    urun_ids = set()
+    if 'urun' in serializer.validated_data:
+        urun_ids.add(serializer.validated_data['urun'].id)
+    if previous_urun_id is not None:
+        urun_ids.add(previous_urun_id)
+
+    with transaction.atomic():
+        urunler = _lock_urunler(urun_ids)
+        supplier = serializer.save()
+        for urun in urunler.values():
+            urun.refresh_supplier_summary()
+        # urun_detail güncel özet alanlarıyla serialize edilsin
+        if supplier.urun_id in urunler:
+            supplier.urun = urunler[supplier.urun_id]
+    return supplier
+
+
+def delete_supplier(supplier):
+    """Supplier'ı siler ve ürünün tedarikçi özetini günceller"""
+    with transaction.atomic():
+        urunler = _lock_urunler([supplier.urun_id])
+        supplier.delete()
+        for urun in urunler.values():
+            urun.refresh_supplier_summary()
 
 
 class UrunListCreateView(generics.ListCreateAPIView):
@@ -144,7 +182,7 @@ class SupplierListCreateView(generics.ListCreateAPIView):
         """Yeni supplier ekler"""
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            save_supplier(serializer)
             return Response({
                 'success': True,
                 'message': 'Supplier başarıyla eklendi',
@@ -183,7 +221,7 @@ class SupplierRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
         supplier = self.get_object()
         serializer = self.get_serializer(supplier, data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            save_supplier(serializer, previous_urun_id=supplier.urun_id)
             return Response({
                 'success': True,
                 'message': 'Supplier başarıyla güncellendi',
@@ -200,7 +238,7 @@ class SupplierRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
         supplier = self.get_object()
         serializer = self.get_serializer(supplier, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            save_supplier(serializer, previous_urun_id=supplier.urun_id)
             return Response({
                 'success': True,
                 'message': 'Supplier başarıyla güncellendi',
@@ -215,7 +253,7 @@ class SupplierRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     def delete(self, request, *args, **kwargs):
         """Supplier'ı siler"""
         supplier = self.get_object()
-        supplier.delete()
+        delete_supplier(supplier)
         return Response({
             'success': True,
             'message': 'Supplier başarıyla silindi'
@@ -262,7 +300,6 @@ class UpdateStockView(generics.GenericAPIView):
     """
 
     def post(self, request, *args, **kwargs):
-        print(request.data)
         """Ürün stoklarını günceller"""
         product_id = request.data.get('product_id')
         stock_updates = request.data.get('stock_updates', [])
@@ -279,59 +316,70 @@ class UpdateStockView(generics.GenericAPIView):
                 'message': 'stock_updates is required and cannot be empty'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            product = Urun.objects.get(id=product_id)
-        except Urun.DoesNotExist:
-            return Response({
-                'success': False,
-                'message': f'Product with id {product_id} not found'
-            }, status=status.HTTP_404_NOT_FOUND)
-
-        total_added = 0
-
-        for update in stock_updates:
-            supplier_id = update.get('supplier_id')
-            quantity = update.get('quantity')
-
-            if not supplier_id or quantity is None:
-                return Response({
-                    'success': False,
-                    'message': 'Each stock_update must have supplier_id and quantity'
-                }, status=status.HTTP_400_BAD_REQUEST)
-
-            if quantity < 0:
-                return Response({
-                    'success': False,
-                    'message': 'Quantity cannot be negative'
-                }, status=status.HTTP_400_BAD_REQUEST)
-
+        # Eşzamanlı isteklerde kayıp güncelleme olmaması için ürün satırı
+        # kilitlenir; aynı ürüne ait güncellemeler sırayla işlenir.
+        with transaction.atomic():
             try:
-                supplier = Supplier.objects.get(id=supplier_id, urun=product)
-            except Supplier.DoesNotExist:
+                product = Urun.objects.select_for_update().get(id=product_id)
+            except Urun.DoesNotExist:
                 return Response({
                     'success': False,
-                    'message': f'Supplier with id {supplier_id} not found for this product'
+                    'message': f'Product with id {product_id} not found'
                 }, status=status.HTTP_404_NOT_FOUND)
 
-            # Check if supplier has enough stock
-            if quantity > supplier.miktar:
-                return Response({
-                    'success': False,
-                    'message': f'Supplier {supplier.name} has only {supplier.miktar} items available, requested {quantity}'
-                }, status=status.HTTP_400_BAD_REQUEST)
-
-            # Update supplier's quantity (subtract from available stock)
-            supplier.miktar -= quantity
-            supplier.save()
-            total_added += quantity
-
-        # Update product's total quantity by summing all suppliers' remaining quantities
-        total_product_quantity = Supplier.objects.filter(urun=product).aggregate(
-            total=models.Sum('miktar')
-        )['total'] or 0
-
-        product.miktar = total_product_quantity
-        product.save()
+            total_added = 0
+
+            for update in stock_updates:
+                supplier_id = update.get('supplier_id')
+                quantity = update.get('quantity')
+
+                if not supplier_id or quantity is None:
+                    transaction.set_rollback(True)
+                    return Response({
+                        'success': False,
+                        'message': 'Each stock_update must have supplier_id and quantity'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+
+                if quantity < 0:
+                    transaction.set_rollback(True)
+                    return Response({
+                        'success': False,
+                        'message': 'Quantity cannot be negative'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+
+                try:
+                    supplier = Supplier.objects.select_for_update().get(id=supplier_id, urun=product)
+                except Supplier.DoesNotExist:
+                    transaction.set_rollback(True)
+                    return Response({
+                        'success': False,
+                        'message': f'Supplier with id {supplier_id} not found for this product'
+                    }, status=status.HTTP_404_NOT_FOUND)
+
+                # Check if supplier has enough stock
+                if quantity > supplier.miktar:
+                    transaction.set_rollback(True)
+                    return Response({
+                        'success': False,
+                        'message': f'Supplier {supplier.name} has only {supplier.miktar} items available, requested {quantity}'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+
+                # Update supplier's quantity (subtract from available stock)
+                supplier.miktar -= quantity
+                supplier.save(update_fields=['miktar', 'guncelleme_tarihi'])
+                total_added += quantity
+
+            # Update product's total quantity by summing all suppliers' remaining quantities,
+            # refreshing the supplier summary fields in the same aggregate query
+            summary = Supplier.objects.filter(urun=product).aggregate(
+                total=models.Sum('miktar'),
+                **Urun.supplier_summary_aggregates()
+            )
+
+            product.miktar = summary['total'] or 0
+            for field in Urun.SUPPLIER_SUMMARY_FIELDS:
+                setattr(product, field, summary[field])
+            product.save(update_fields=['miktar', 'guncelleme_tarihi'] + Urun.SUPPLIER_SUMMARY_FIELDS)
 
         # Serialize the updated product
         serializer = UrunSerializer(product)
@@ -341,3 +389,47 @@ class UpdateStockView(generics.GenericAPIView):
             'message': f'Stock updated successfully. Added {total_added} items.',
             'data': serializer.data
         }, status=status.HTTP_200_OK)
+
+
+class JobCreateView(generics.CreateAPIView):
+    """
+    Arka plan işi oluşturma endpoint'i
+    POST: İşi kuyruğa ekler ve hemen 202 döner; iş run_worker tarafından çalıştırılır
+    """
+    serializer_class = JobSerializer
+
+    def post(self, request, *args, **kwargs):
+        """Yeni iş kuyruğa ekler"""
+        serializer = self.get_serializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save()
+            return Response({
+                'success': True,
+                'message': 'Job queued',
+                'data': serializer.data
+            }, status=status.HTTP_202_ACCEPTED,
+                headers={'Location': reverse('job-detail', kwargs={'pk': serializer.instance.pk})})
+        return Response({
+            'success': False,
+            'message': 'Job could not be queued',
+            'errors': serializer.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+
+class JobRetrieveView(generics.RetrieveAPIView):
+    """
+    Arka plan işi durum endpoint'i
+    GET: İşin durumunu, ilerlemesini ve sonucunu getirir
+    """
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+
+    def get(self, request, *args, **kwargs):
+        """İş durumunu getirir"""
+        job = self.get_object()
+        serializer = self.get_serializer(job)
+        return Response({
+            'success': True,
+            'message': f'Job {job.pk} is {job.status}',
+            'data': serializer.data
+        }, status=status.HTTP_200_OK)